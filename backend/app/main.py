@@ -2,11 +2,19 @@
 
 from contextlib import asynccontextmanager
 
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
 
 from .api.routes.analysis import router as analysis_router
 from .core.config import get_settings
+from .services.embedding_store import EmbeddingStore
 
 
 @asynccontextmanager
@@ -15,6 +23,8 @@ async def lifespan(app: FastAPI):
 
     settings = get_settings()
     app.state.settings = settings
+    # Load the embedding model before serving so the first analysis request starts warm.
+    app.state.embedding_model = await to_thread.run_sync(EmbeddingStore.preload_model, settings.embedding_model)
     yield
 
 
@@ -28,6 +38,7 @@ def create_application() -> FastAPI:
         redoc_url=f"{settings.api_prefix}/redoc",
         openapi_url=f"{settings.api_prefix}/openapi.json",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
     )
 
     application.add_middleware(
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Tuple
 
 
 @dataclass(slots=True)
@@ -14,6 +14,15 @@ class Document:
     path: Path
     content: str
     metadata: Dict[str, str] = field(default_factory=dict)
+    parts: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    suffix: str = field(init=False, repr=False, compare=False)
+    top_dir: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Derived once here so the artifact builders never re-parse ``path``.
+        self.parts = self.path.parts
+        self.suffix = self.path.suffix.lower()
+        self.top_dir = self.parts[0] if len(self.parts) > 1 else "<root>"
 
     @property
     def id(self) -> str:
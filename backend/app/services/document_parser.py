@@ -2,11 +2,57 @@
 
 from __future__ import annotations
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 from ..models import Document
-from ..utils import is_probably_text, matches_any
+from ..utils import compile_fast_globs, excluded_dir_names, suffix_decision
+
+
+_MAX_READ_WORKERS = 32
+_BINARY_SNIFF_BYTES = 8192
+
+
+def _sorted_entries(dir_path: str) -> Iterator[os.DirEntry[str]]:
+    """Return the entries of ``dir_path`` sorted by name, or nothing if it cannot be listed."""
+
+    try:
+        with os.scandir(dir_path) as it:
+            return iter(sorted(it, key=lambda entry: entry.name))
+    except OSError:
+        return iter(())
+
+
+def _safe_read_text(file_path: str) -> Optional[str]:
+    """Read ``file_path`` as UTF-8, returning ``None`` for binary or unreadable files."""
+
+    # Known binary suffixes are rejected without touching the file.
+    if suffix_decision(file_path) is False:
+        return None
+
+    # One open serves both the NUL-byte sniff and the decode; the rest is only read once the
+    # prefix looks like text, so large binaries never get loaded whole.
+    try:
+        with open(file_path, "rb") as fh:
+            head = fh.read(_BINARY_SNIFF_BYTES)
+            if b"\x00" in head:
+                return None
+            data = head + fh.read()
+    except OSError:
+        return None
+
+    try:
+        content = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+    # Match ``read_text`` universal-newline handling.
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
 
 
 class DocumentParser:
@@ -21,38 +67,76 @@ class DocumentParser:
         exclude_globs: Iterable[str],
         max_files: int,
     ) -> List[Document]:
+        candidates = self._iter_candidates(include_globs, exclude_globs)
         documents: List[Document] = []
 
-        for file_path in sorted(self.base_path.rglob("*")):
-            if not file_path.is_file():
+        # File reads release the GIL, so a thread pool overlaps the blocking I/O.
+        with ThreadPoolExecutor(max_workers=_MAX_READ_WORKERS) as executor:
+            while len(documents) < max_files:
+                batch = list(islice(candidates, max(1, max_files - len(documents))))
+                if not batch:
+                    break
+
+                contents = executor.map(_safe_read_text, (file_path for file_path, _ in batch))
+                for (_, rel_posix), content in zip(batch, contents):
+                    if content is None:
+                        continue
+
+                    documents.append(
+                        Document(
+                            path=Path(rel_posix),
+                            content=content,
+                            metadata={"source": rel_posix},
+                        )
+                    )
+
+                    if len(documents) >= max_files:
+                        break
+
+        documents.sort(key=lambda doc: doc.path)
+        return documents
+
+    def _iter_candidates(
+        self,
+        include_globs: Iterable[str],
+        exclude_globs: Iterable[str],
+    ) -> Iterator[Tuple[str, str]]:
+        """Lazily yield ``(absolute, relative POSIX)`` path strings of files matching the glob filters.
+
+        Paths stay plain strings so that ``Path`` objects are only built for accepted documents.
+        """
+
+        include_globs = tuple(include_globs)
+        exclude_globs = tuple(exclude_globs)
+        include_match = compile_fast_globs(include_globs) if include_globs else None
+        exclude_match = compile_fast_globs(exclude_globs) if exclude_globs else None
+        prune_dirs = excluded_dir_names(exclude_globs)
+
+        # Depth-first scandir walk that descends into each directory at its name-sorted position,
+        # matching ``sorted(rglob("*"))`` order; excluded directories are never opened.
+        stack: List[Tuple[Iterator[os.DirEntry[str]], str]] = [(_sorted_entries(os.fspath(self.base_path)), "")]
+        while stack:
+            entries, rel_dir = stack[-1]
+            entry = next(entries, None)
+            if entry is None:
+                stack.pop()
                 continue
 
-            relative_path = file_path.relative_to(self.base_path)
-            rel_posix = relative_path.as_posix()
+            rel_posix = rel_dir + entry.name
 
-            if include_globs and not matches_any(Path(rel_posix), include_globs):
+            if entry.is_dir(follow_symlinks=False):
+                # ``**/name/**`` needs a ``/`` before ``name``, so a top-level ``name`` is not excluded.
+                if not rel_dir or entry.name not in prune_dirs:
+                    stack.append((_sorted_entries(entry.path), rel_posix + "/"))
                 continue
 
-            if exclude_globs and matches_any(Path(rel_posix), exclude_globs):
+            if not entry.is_file():
                 continue
 
-            if not is_probably_text(file_path):
+            if include_match is not None and not include_match(rel_posix):
                 continue
 
-            try:
-                content = file_path.read_text(encoding="utf-8")
-            except UnicodeDecodeError:
+            if exclude_match is not None and exclude_match(rel_posix):
                 continue
 
-            documents.append(
-                Document(
-                    path=relative_path,
-                    content=content,
-                    metadata={"source": rel_posix},
-                )
-            )
-
-            if len(documents) >= max_files:
-                break
-
-        return documents
+            yield entry.path, rel_posix
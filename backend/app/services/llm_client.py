@@ -15,6 +15,29 @@ from ..core.config import Settings
 
 logger = logging.getLogger(__name__)
 
+_COMPOSITE_PROMPT_TEMPLATE = textwrap.dedent(
+    """
+    You must follow the system instruction first.
+
+    System instruction:
+    {system_prompt}
+
+    User request:
+    {user_prompt}
+    """
+).strip()
+
+_FALLBACK_TEMPLATE = textwrap.dedent(
+    """
+    No Gemini credentials detected (or initialisation failed). Here's a heuristic summary based on the
+    prompts provided:
+
+    {combined}
+
+    (Configure GOOGLE_API_KEY to replace this fallback with real model generations.)
+    """
+).strip()
+
 
 class LLMClient:
     """Wrapper around Google Gemini that gracefully degrades when unavailable."""
@@ -37,17 +60,7 @@ class LLMClient:
         if self._model is None:
             return self._fallback_response(system_prompt, user_prompt)
 
-        composite_prompt = textwrap.dedent(
-            f"""
-            You must follow the system instruction first.
-
-            System instruction:
-            {system_prompt}
-
-            User request:
-            {user_prompt}
-            """
-        ).strip()
+        composite_prompt = _COMPOSITE_PROMPT_TEMPLATE.format(system_prompt=system_prompt, user_prompt=user_prompt)
 
         try:
             response = self._model.generate_content(
@@ -74,13 +87,4 @@ class LLMClient:
     @staticmethod
     def _fallback_response(system_prompt: str, user_prompt: str) -> str:
         combined = f"System: {system_prompt}\nUser: {user_prompt}"
-        return textwrap.dedent(
-            f"""
-            No Gemini credentials detected (or initialisation failed). Here's a heuristic summary based on the
-            prompts provided:
-
-            {combined[:1200]}
-
-            (Configure GOOGLE_API_KEY to replace this fallback with real model generations.)
-            """
-        ).strip()
+        return _FALLBACK_TEMPLATE.format(combined=combined[:1200])
@@ -4,10 +4,19 @@ from __future__ import annotations
 
 import json
 import textwrap
-from collections import Counter, defaultdict
-from typing import Dict, List
+from collections import Counter, OrderedDict, defaultdict
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from weakref import WeakValueDictionary
 
-from anyio import to_thread
+from anyio import Lock, create_task_group, to_thread
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
 
 from ..core.config import Settings
 from ..models import Document
@@ -19,6 +28,57 @@ from .llm_client import LLMClient
 from .repo_loader import RepositoryFetcher
 
 
+_CorpusKey = Tuple[str, str, FrozenSet[str], FrozenSet[str], int]
+_Corpus = Tuple[List[Document], Optional[EmbeddingStore]]
+
+_CORPUS_CACHE_SIZE = 8
+
+# Artifact templates are dedented once at import rather than on every request.
+_SUMMARY_PROMPT_TEMPLATE = textwrap.dedent(
+    """
+    Provide a high-level summary of this repository.
+    There are {document_count} textual documents. Here are sample file paths:
+    {top_files}
+    """
+)
+
+_VECTOR_STORE_TEMPLATE = textwrap.dedent(
+    """
+    Vector store constructed with {document_count} documents using
+    model `{model_name}`.
+    """
+).strip()
+
+_ONBOARDING_TEMPLATE = textwrap.dedent(
+    """
+    ## Onboarding Guide
+
+    1. Clone the repository and install dependencies.
+    2. Review the primary project files:
+    {key_files}
+    3. Run the automated tests to validate the setup.
+    4. Explore remaining modules following the architecture map.
+    """
+).strip()
+
+_CHANGE_IMPACT_TEMPLATE = textwrap.dedent(
+    """
+    ## Change Impact Considerations
+
+    When modifying this repository, pay attention to the following file type distribution:
+    {extension_summary}
+
+    Use the vector search endpoint to validate whether changes impact related files.
+    """
+).strip()
+
+
+def _dump_json(value: Dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(value, indent=2)
+
+
 class RAGPipeline:
     """Coordinates ingestion, vectorization, and artifact generation."""
 
@@ -26,28 +86,31 @@ class RAGPipeline:
         self.settings = settings
         self.fetcher = RepositoryFetcher(settings)
         self.llm = LLMClient(settings)
+        self._corpus_cache: OrderedDict[_CorpusKey, _Corpus] = OrderedDict()
+        self._repo_locks: WeakValueDictionary[str, Lock] = WeakValueDictionary()
 
     async def analyze_repository(self, payload: RepositoryAnalysisRequest) -> RepositoryAnalysisResponse:
-        repo_path = await to_thread.run_sync(
-            self.fetcher.fetch,
-            payload.repo_url,
-            payload.branch,
-            payload.refresh,
-        )
+        repo_url = str(payload.repo_url)
+
+        # Every request for a URL shares one worktree, so another branch must not be checked out
+        # between this fetch and the parse whose corpus is cached under the fetched SHA.
+        async with self._repo_lock(repo_url):
+            repo_path, head_sha = await self._fetch_with_model_prewarm(payload)
+
+            cache_key: _CorpusKey = (
+                repo_url,
+                head_sha,
+                frozenset(payload.include_globs),
+                frozenset(payload.exclude_globs),
+                self.settings.max_files,
+            )
+            corpus = None if payload.refresh else self._get_cached_corpus(cache_key)
 
-        parser = DocumentParser(repo_path)
-        documents = await to_thread.run_sync(
-            parser.parse,
-            payload.include_globs,
-            payload.exclude_globs,
-            self.settings.max_files,
-        )
+            if corpus is None:
+                corpus = await self._build_corpus(repo_path, payload)
+                self._cache_corpus(cache_key, corpus)
 
-        if documents:
-            vector_store = EmbeddingStore(self.settings.embedding_model)
-            await to_thread.run_sync(vector_store.build, documents)
-        else:
-            vector_store = None
+        documents, vector_store = corpus
 
         architecture_map = self._build_architecture_map(documents)
         artifacts = self._generate_artifacts(documents, vector_store, architecture_map)
@@ -64,6 +127,67 @@ class RAGPipeline:
             change_impact_analysis=change_impact,
         )
 
+    def _repo_lock(self, repo_url: str) -> Lock:
+        # Weak values drop a URL's lock once no request holds or awaits it.
+        lock = self._repo_locks.get(repo_url)
+        if lock is None:
+            lock = self._repo_locks[repo_url] = Lock()
+        return lock
+
+    async def _fetch_with_model_prewarm(self, payload: RepositoryAnalysisRequest) -> Tuple[Path, str]:
+        """Fetch the repository, loading the embedding model in parallel if startup did not."""
+
+        fetch = partial(self.fetcher.fetch, payload.repo_url, payload.branch, payload.refresh)
+        model_name = self.settings.embedding_model
+        if EmbeddingStore._get_cached_model(model_name) is not None:
+            return await to_thread.run_sync(fetch)
+
+        fetch_error: Optional[Exception] = None
+        async with create_task_group() as tg:
+            tg.start_soon(
+                partial(to_thread.run_sync, EmbeddingStore.preload_model, model_name, abandon_on_cancel=True)
+            )
+            try:
+                fetched = await to_thread.run_sync(fetch)
+            except Exception as exc:
+                # Re-raised outside the task group so callers see the original error type; the
+                # preload is left to finish in its thread instead of delaying the error.
+                fetch_error = exc
+                tg.cancel_scope.cancel()
+
+        if fetch_error is not None:
+            raise fetch_error
+        return fetched
+
+    async def _build_corpus(self, repo_path: Path, payload: RepositoryAnalysisRequest) -> _Corpus:
+        parser = DocumentParser(repo_path)
+        documents = await to_thread.run_sync(
+            parser.parse,
+            payload.include_globs,
+            payload.exclude_globs,
+            self.settings.max_files,
+        )
+
+        if documents:
+            vector_store = EmbeddingStore(self.settings.embedding_model)
+            await to_thread.run_sync(vector_store.build, documents)
+        else:
+            vector_store = None
+
+        return documents, vector_store
+
+    def _get_cached_corpus(self, key: _CorpusKey) -> Optional[_Corpus]:
+        corpus = self._corpus_cache.get(key)
+        if corpus is not None:
+            self._corpus_cache.move_to_end(key)
+        return corpus
+
+    def _cache_corpus(self, key: _CorpusKey, corpus: _Corpus) -> None:
+        self._corpus_cache[key] = corpus
+        self._corpus_cache.move_to_end(key)
+        while len(self._corpus_cache) > _CORPUS_CACHE_SIZE:
+            self._corpus_cache.popitem(last=False)
+
     def _generate_artifacts(
         self,
         documents: List[Document],
@@ -78,19 +202,17 @@ class RAGPipeline:
 
         artifacts = [
             Artifact(name="Repository Summary", content=summary, format="markdown"),
-            Artifact(name="Architecture Map", content=json.dumps(architecture_map, indent=2), format="json"),
+            Artifact(name="Architecture Map", content=_dump_json(architecture_map), format="json"),
             Artifact(name="Mermaid Diagram", content=mermaid, format="mermaid"),
             Artifact(name="Onboarding Guide", content=onboarding, format="markdown"),
             Artifact(name="Change Impact Analysis", content=change_impact, format="markdown"),
         ]
 
         if vector_store is not None:
-            retrieval_notes = textwrap.dedent(
-                f"""
-                Vector store constructed with {len(vector_store.documents)} documents using
-                model `{vector_store.model_name}`.
-                """
-            ).strip()
+            retrieval_notes = _VECTOR_STORE_TEMPLATE.format(
+                document_count=len(vector_store.documents),
+                model_name=vector_store.model_name,
+            )
             artifacts.append(
                 Artifact(name="Vector Store", content=retrieval_notes, format="markdown")
             )
@@ -104,21 +226,21 @@ class RAGPipeline:
         if self.llm.is_configured:
             top_files = "\n".join(f"- `{doc.path}`" for doc in documents[:10])
             system_prompt = "You summarize codebases for onboarding engineers."
-            user_prompt = textwrap.dedent(
-                f"""
-                Provide a high-level summary of this repository.
-                There are {len(documents)} textual documents. Here are sample file paths:\n{top_files}
-                """
-            )
+            user_prompt = _SUMMARY_PROMPT_TEMPLATE.format(document_count=len(documents), top_files=top_files)
             return self.llm.generate(system_prompt, user_prompt)
 
         return self._heuristic_summary(documents)
 
     def _heuristic_summary(self, documents: List[Document]) -> str:
-        readme = next((doc for doc in documents if doc.path.name.lower().startswith("readme")), None)
+        readme: Document | None = None
+        extension_counts: Counter[str] = Counter()
+        dir_counts: Counter[str] = Counter()
 
-        extension_counts = Counter(doc.path.suffix.lower() or "<root>" for doc in documents)
-        dir_counts = Counter(doc.path.parts[0] if len(doc.path.parts) > 1 else "<root>" for doc in documents)
+        for doc in documents:
+            extension_counts[doc.suffix or "<root>"] += 1
+            dir_counts[doc.top_dir] += 1
+            if readme is None and doc.parts[-1].lower().startswith("readme"):
+                readme = doc
 
         top_extensions = "\n".join(
             f"- `{ext}`: {count} file{'s' if count != 1 else ''}"
@@ -154,12 +276,11 @@ class RAGPipeline:
     def _build_architecture_map(self, documents: List[Document]) -> Dict[str, Dict]:
         tree: Dict[str, Dict] = {}
 
-        for doc in documents:
+        for parts in (doc.parts for doc in documents):
             node = tree
-            for part in doc.path.parts[:-1]:
+            for part in parts[:-1]:
                 node = node.setdefault(part, {})
-            files = node.setdefault("__files__", [])
-            files.append(doc.path.name)
+            node.setdefault("__files__", []).append(parts[-1])
 
         return tree
 
@@ -167,14 +288,15 @@ class RAGPipeline:
         lines = ["graph TD", "    Repo[Repository]"]
 
         def walk(node: Dict, prefix: str) -> None:
-            for key, value in list(node.items())[:10]:  # limit for readability
+            # ``prefix`` is already sanitised, so only the new segment needs replacing.
+            for key, value in islice(node.items(), 10):  # limit for readability
                 if key == "__files__":
                     for filename in value[:10]:
-                        file_node = f"{prefix}_{filename}".replace("-", "_")
+                        file_node = f"{prefix}_{filename.replace('-', '_')}"
                         lines.append(f"    {prefix} --> {file_node}[{filename}]")
                     continue
 
-                child = f"{prefix}_{key}".replace("-", "_")
+                child = f"{prefix}_{key.replace('-', '_')}"
                 lines.append(f"    {prefix} --> {child}")
                 walk(value, child)
 
@@ -187,17 +309,7 @@ class RAGPipeline:
             return "Repository appears empty; nothing to onboard."
 
         key_files = "\n".join(f"- `{doc.path}`" for doc in documents[:5])
-        return textwrap.dedent(
-            f"""
-            ## Onboarding Guide
-
-            1. Clone the repository and install dependencies.
-            2. Review the primary project files:
-{key_files}
-            3. Run the automated tests to validate the setup.
-            4. Explore remaining modules following the architecture map.
-            """
-        ).strip()
+        return _ONBOARDING_TEMPLATE.format(key_files=key_files)
 
     def _build_change_impact(self, documents: List[Document]) -> str:
         if not documents:
@@ -205,16 +317,7 @@ class RAGPipeline:
 
         extensions = defaultdict(int)
         for doc in documents:
-            extensions[doc.path.suffix or "<root>"] += 1
+            extensions[doc.suffix or "<root>"] += 1
 
         extension_summary = "\n".join(f"- `{ext}`: {count} files" for ext, count in extensions.items())
-        return textwrap.dedent(
-            f"""
-            ## Change Impact Considerations
-
-            When modifying this repository, pay attention to the following file type distribution:
-{extension_summary}
-
-            Use the vector search endpoint to validate whether changes impact related files.
-            """
-        ).strip()
+        return _CHANGE_IMPACT_TEMPLATE.format(extension_summary=extension_summary)
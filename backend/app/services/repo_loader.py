@@ -5,7 +5,7 @@ from __future__ import annotations
 import hashlib
 import shutil
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from git import Repo
 
@@ -20,10 +20,12 @@ class RepositoryFetcher:
         self.settings.workspace_dir.mkdir(parents=True, exist_ok=True)
 
     def _resolve_repo_path(self, repo_url: str) -> Path:
-        repo_hash = hashlib.sha1(repo_url.encode("utf-8"), usedforsecurity=False).hexdigest()
+        repo_hash = hashlib.blake2b(repo_url.encode("utf-8"), digest_size=12).hexdigest()
         return self.settings.workspace_dir / repo_hash
 
-    def fetch(self, repo_url: str, branch: Optional[str] = None, refresh: bool = False) -> Path:
+    def fetch(self, repo_url: str, branch: Optional[str] = None, refresh: bool = False) -> Tuple[Path, str]:
+        """Clone or update ``repo_url`` and return its worktree path and HEAD commit SHA."""
+
         repo_url_str = str(repo_url)
         destination = self._resolve_repo_path(repo_url_str)
 
@@ -32,11 +34,14 @@ class RepositoryFetcher:
 
         if destination.exists() and not refresh:
             repo = Repo(destination)
-            repo.remote().pull()
+            # Shallow single-branch clones only track one ref, so fetch the requested one explicitly.
+            repo.remote().fetch(branch or "HEAD", depth=1)
+            repo.git.checkout("--force", "--detach", "FETCH_HEAD")
         else:
-            repo = Repo.clone_from(repo_url_str, destination)
-
-        if branch:
-            repo.git.checkout(branch)
+            # Analysis only needs the current tree, not the history.
+            clone_options = {"depth": 1, "single_branch": True}
+            if branch:
+                clone_options["branch"] = branch
+            repo = Repo.clone_from(repo_url_str, destination, **clone_options)
 
-        return destination
+        return destination, repo.head.commit.hexsha
@@ -1,5 +1,19 @@
 """Helper utilities used across the application."""
 
-from .file_filters import is_probably_text, matches_any
+from .file_filters import (
+    compile_fast_globs,
+    compile_globs,
+    excluded_dir_names,
+    is_probably_text,
+    matches_any,
+    suffix_decision,
+)
 
-__all__ = ["is_probably_text", "matches_any"]
+__all__ = [
+    "compile_fast_globs",
+    "compile_globs",
+    "excluded_dir_names",
+    "is_probably_text",
+    "matches_any",
+    "suffix_decision",
+]
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+import codecs
 import fnmatch
-from pathlib import Path
-from typing import Iterable
+import os
+import re
+from functools import lru_cache, partial
+from pathlib import PurePath
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
 
 
-TEXTUAL_EXTENSIONS = {
+TEXTUAL_EXTENSIONS = frozenset({
     ".py",
     ".md",
     ".json",
@@ -32,28 +36,212 @@ TEXTUAL_EXTENSIONS = {
     ".cpp",
     ".cxx",
     ".scala",
+})
+
+BINARY_EXTENSIONS = frozenset({
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".bmp",
+    ".ico",
+    ".webp",
+    ".pdf",
+    ".zip",
+    ".gz",
+    ".tgz",
+    ".bz2",
+    ".xz",
+    ".7z",
+    ".tar",
+    ".jar",
+    ".whl",
+    ".so",
+    ".o",
+    ".a",
+    ".dll",
+    ".dylib",
+    ".exe",
+    ".wasm",
+    ".pyc",
+    ".class",
+    ".woff",
+    ".woff2",
+    ".ttf",
+    ".otf",
+    ".mp3",
+    ".mp4",
+    ".mov",
+    ".sqlite",
+})
+
+# Every common spelling of a known suffix mapped to its text/binary verdict, built once at import.
+# One ``dict.get`` decides the usual case without a ``lower()`` allocation or a second lookup.
+_SUFFIX_DECISIONS: Dict[str, bool] = {
+    spelling: is_text
+    for extensions, is_text in ((BINARY_EXTENSIONS, False), (TEXTUAL_EXTENSIONS, True))
+    for ext in extensions
+    for spelling in (ext, ext.upper(), ext.title())
 }
 
+StrPath = Union[str, "os.PathLike[str]"]
 
-def matches_any(path: Path, patterns: Iterable[str]) -> bool:
-    return any(fnmatch.fnmatch(path.as_posix(), pattern) for pattern in patterns)
+_GLOB_METACHARS = frozenset("*?[]")
 
+_SNIFF_BYTES = 1024
 
-def is_probably_text(path: Path) -> bool:
-    if path.suffix.lower() in TEXTUAL_EXTENSIONS:
-        return True
 
+def compile_globs(patterns: Iterable[str]) -> re.Pattern[str]:
+    """Compile glob patterns into a single anchored alternation regex.
+
+    Use ``.match`` on a POSIX path string. An empty pattern list compiles to a regex that never matches.
+    """
+
+    return _compile_glob_tuple(tuple(sorted(set(patterns))))
+
+
+@lru_cache(maxsize=256)
+def _compile_glob_tuple(patterns: Tuple[str, ...]) -> re.Pattern[str]:
+    if not patterns:
+        return re.compile(r"(?!)")
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+
+def compile_fast_globs(patterns: Iterable[str]) -> Callable[[str], bool]:
+    """Build a predicate over POSIX path strings equivalent to ``fnmatch`` against ``patterns``.
+
+    The shapes that dominate repository filters are answered with grouped ``str`` checks:
+    ``**/*.ext`` (a ``/`` plus a suffix), ``dir/**`` (prefix), ``**/name`` (``/name`` suffix)
+    and ``**/name/**`` (``/name/`` substring). Any other pattern falls back to ``compile_globs``.
+    """
+
+    return _compile_fast_glob_tuple(tuple(sorted(set(patterns))))
+
+
+@lru_cache(maxsize=256)
+def _compile_fast_glob_tuple(patterns: Tuple[str, ...]) -> Callable[[str], bool]:
+    suffixes: List[str] = []
+    prefixes: List[str] = []
+    names: List[str] = []
+    segments: List[str] = []
+    others: List[str] = []
+
+    for pattern in patterns:
+        if pattern.startswith("**/") and pattern.endswith("/**") and _is_literal_segment(pattern[3:-3]):
+            segments.append(f"/{pattern[3:-3]}/")
+        elif pattern.startswith("**/*") and _is_literal_segment(pattern[4:]):
+            suffixes.append(pattern[4:])
+        elif pattern.startswith("**/") and _is_literal_segment(pattern[3:]):
+            names.append(f"/{pattern[3:]}")
+        elif pattern.endswith("/**") and _is_literal(pattern[:-3]):
+            prefixes.append(pattern[:-2])
+        else:
+            others.append(pattern)
+
+    suffix_tuple = tuple(suffixes)
+    prefix_tuple = tuple(prefixes)
+    name_tuple = tuple(names)
+    segment_tuple = tuple(segments)
+    fallback = _compile_glob_tuple(tuple(others)) if others else None
+
+    def matcher(path: str) -> bool:
+        # In fnmatch ``*`` also crosses ``/``, so ``**/*.ext`` only needs some ``/`` before the suffix.
+        if suffix_tuple and "/" in path and path.endswith(suffix_tuple):
+            return True
+        if prefix_tuple and path.startswith(prefix_tuple):
+            return True
+        if name_tuple and path.endswith(name_tuple):
+            return True
+        if segment_tuple and any(segment in path for segment in segment_tuple):
+            return True
+        return fallback is not None and fallback.match(path) is not None
+
+    return matcher
+
+
+def excluded_dir_names(exclude_globs: Iterable[str]) -> FrozenSet[str]:
+    """Return the names ``n`` of ``**/n/**`` patterns in ``exclude_globs`` whose middle is one literal segment.
+
+    Such a pattern excludes everything below a non-root ``n`` directory, so a walk may skip
+    those directories below the top level without opening them.
+    """
+
+    return frozenset(
+        pattern[3:-3]
+        for pattern in exclude_globs
+        if pattern.startswith("**/") and pattern.endswith("/**") and _is_literal_segment(pattern[3:-3])
+    )
+
+
+def _is_literal(text: str) -> bool:
+    return bool(text) and _GLOB_METACHARS.isdisjoint(text)
+
+
+def _is_literal_segment(text: str) -> bool:
+    return _is_literal(text) and "/" not in text
+
+
+def matches_any(path: Union[str, PurePath], patterns: Union[Iterable[str], re.Pattern[str]]) -> bool:
+    """Return whether ``path`` matches any of ``patterns``.
+
+    ``path`` may be a ``PurePath`` or an already-POSIX relative path string; callers that hold
+    the string form pass it directly and skip the ``as_posix`` conversion.
+    """
+
+    posix = path if isinstance(path, str) else path.as_posix()
+    if isinstance(patterns, re.Pattern):
+        return patterns.match(posix) is not None
+    # POSIX paths need no normcase, so fnmatchcase skips that per-pattern step.
+    return any(map(partial(fnmatch.fnmatchcase, posix), patterns))
+
+
+def suffix_decision(path: StrPath) -> Optional[bool]:
+    """Return whether ``path`` has a known text (``True``) or binary (``False``) suffix, else ``None``."""
+
+    suffix = os.path.splitext(os.fspath(path))[1]
+    decision = _SUFFIX_DECISIONS.get(suffix)
+    if decision is None and suffix:
+        decision = _SUFFIX_DECISIONS.get(suffix.lower())
+    return decision
+
+
+def is_probably_text(path: StrPath) -> bool:
+    """Guess whether ``path`` holds text, from its suffix or else its first 1 KiB.
+
+    Plain strings are handled without building a ``Path``; only ``os.fspath`` string operations are used.
+    """
+
+    decision = suffix_decision(path)
+    if decision is not None:
+        return decision
+
+    # Raw descriptor I/O skips building a BufferedReader for a single small read.
     try:
-        with path.open("rb") as fh:
-            chunk = fh.read(1024)
+        fd = os.open(os.fspath(path), os.O_RDONLY | getattr(os, "O_BINARY", 0))
     except OSError:
         return False
+    try:
+        chunk = os.read(fd, _SNIFF_BYTES)
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
 
+    # NUL means binary; pure ASCII (a word-at-a-time C scan) needs no UTF-8 state machine.
     if b"\x00" in chunk:
         return False
+    if chunk.isascii():
+        return True
+    # Only a full read can have cut a multi-byte character short.
+    return _is_valid_utf8_prefix(chunk, truncated=len(chunk) == _SNIFF_BYTES)
+
+
+def _is_valid_utf8_prefix(chunk: bytes, truncated: bool) -> bool:
+    """Validate ``chunk`` as UTF-8, tolerating a multi-byte character cut off at the end if ``truncated``."""
 
     try:
-        chunk.decode("utf-8")
-        return True
+        # ``final=False`` leaves a truncated trailing sequence unconsumed instead of raising.
+        codecs.utf_8_decode(chunk, "strict", not truncated)
     except UnicodeDecodeError:
         return False
+    return True
@@ -4,10 +4,23 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Tuple
 
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+from urllib3.util.retry import Retry
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None  # type: ignore
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
 
 
 def get_backend_url() -> str:
@@ -48,9 +61,17 @@ def get_request_timeout() -> float:
 st.set_page_config(page_title="Repo RAG Analyst", layout="wide")
 
 
-BACKEND_URL = get_backend_url()
-REQUEST_TIMEOUT = get_request_timeout()
+@st.cache_resource
+def get_backend_config() -> Tuple[str, float]:
+    """Resolve the backend URL and timeout once per process instead of on every rerun."""
+
+    return get_backend_url(), get_request_timeout()
+
+
+BACKEND_URL, REQUEST_TIMEOUT = get_backend_config()
 API_PATH = "/api/analysis/run"
+MERMAID_FORMATS = frozenset({"mermaid", "mermaidjs"})
+ANALYSIS_URL = f"{BACKEND_URL}{API_PATH}"
 
 st.title("🔍 Repo RAG Analyst")
 st.caption("Analyze GitHub repositories and generate onboarding artifacts with Retrieval-Augmented Generation.")
@@ -85,26 +106,67 @@ def render_sidebar() -> Dict[str, Any]:
     }
 
 
-def trigger_analysis(payload: Dict[str, Any]) -> Dict[str, Any]:
-    response = requests.post(
-        f"{BACKEND_URL}{API_PATH}",
-        json=payload,
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Return a process-wide session so reruns reuse the keep-alive connection to the backend."""
+
+    # urllib3's default retryable methods exclude POST, so only connection errors are retried;
+    # a read timeout or gateway status may mean the backend is still running the analysis.
+    retry = Retry(total=2, backoff_factor=0.3)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+def trigger_analysis(payload: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+    """Yield the top-level ``(field, value)`` pairs of the analysis response as they are parsed."""
+
+    if orjson is not None:
+        body: Dict[str, Any] = {"data": orjson.dumps(payload), "headers": {"Content-Type": "application/json"}}
+    else:
+        body = {"json": payload}
+
+    with get_http_session().post(
+        ANALYSIS_URL,
+        **body,
+        stream=True,
         timeout=(10, REQUEST_TIMEOUT),
-    )
-    response.raise_for_status()
-    return response.json()
+    ) as response:
+        if not response.ok:
+            # Buffer the error body before the connection is released so callers can show it.
+            _ = response.content
+            response.raise_for_status()
+
+        # Reading ``response.raw`` bypasses requests' exception mapping, so body-read stalls and
+        # dropped connections are translated into the requests errors handled by the caller.
+        response.raw.decode_content = True
+        try:
+            if ijson is None:
+                yield from json.loads(response.raw.read()).items()
+            else:
+                yield from ijson.kvitems(response.raw, "")
+        except ReadTimeoutError as exc:
+            raise requests.exceptions.ReadTimeout(exc, request=response.request) from exc
+        except ProtocolError as exc:
+            raise requests.exceptions.ChunkedEncodingError(exc, request=response.request) from exc
 
 
 def render_artifacts(artifacts: List[Dict[str, Any]]):
     st.header("Generated Artifacts")
     for artifact in artifacts:
-        with st.expander(f"{artifact['name']} ({artifact['format']})", expanded=artifact.get("format") == "markdown"):
-            if artifact.get("format") == "json":
-                st.json(json.loads(artifact["content"]))
-            elif artifact.get("format") in {"mermaid", "mermaidjs"}:
-                st.markdown(f"```mermaid\n{artifact['content']}\n```")
+        fmt = artifact.get("format")
+        content = artifact["content"]
+        with st.expander(f"{artifact['name']} ({fmt})", expanded=fmt == "markdown"):
+            if fmt == "json":
+                st.json(orjson.loads(content) if orjson is not None else json.loads(content))
+            elif fmt in MERMAID_FORMATS:
+                st.markdown(f"```mermaid\n{content}\n```")
             else:
-                st.markdown(artifact["content"])
+                st.markdown(content)
 
 
 def render_architecture_section(architecture_map: Dict[str, Any]):
@@ -112,6 +174,22 @@ def render_architecture_section(architecture_map: Dict[str, Any]):
     st.json(architecture_map)
 
 
+def render_result_field(field: str, value: Any):
+    if field == "artifacts":
+        render_artifacts(value or [])
+    elif field == "architecture_map" and value:
+        render_architecture_section(value)
+    elif field == "mermaid_diagram" and value:
+        st.header("Mermaid Diagram")
+        st.markdown(f"```mermaid\n{value}\n```")
+    elif field == "onboarding_guide" and value:
+        st.header("Onboarding Guide")
+        st.markdown(value)
+    elif field == "change_impact_analysis" and value:
+        st.header("Change Impact Analysis")
+        st.markdown(value)
+
+
 payload = render_sidebar()
 
 if st.button("Run Analysis", type="primary", use_container_width=True):
@@ -122,8 +200,11 @@ if st.button("Run Analysis", type="primary", use_container_width=True):
             "Running RAG pipeline... the first run may take a couple of minutes while models download"
         ):
             try:
-                result = trigger_analysis(payload)
-            except requests.exceptions.Timeout:
+                # Response fields arrive in display order, so each section renders as soon as it is parsed.
+                for field, value in trigger_analysis(payload):
+                    render_result_field(field, value)
+            except (requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError):
+                # A proxy dropping a stalled response mid-body surfaces as a broken chunked read.
                 st.error(
                     "The analysis took too long and timed out. Consider narrowing the file filters or increasing BACKEND_TIMEOUT."
                 )
@@ -131,18 +212,5 @@ if st.button("Run Analysis", type="primary", use_container_width=True):
                 st.error(f"Request failed: {exc.response.text}")
             except Exception as exc:  # noqa: BLE001
                 st.error(f"Unexpected error: {exc}")
-            else:
-                render_artifacts(result.get("artifacts", []))
-                if architecture_map := result.get("architecture_map"):
-                    render_architecture_section(architecture_map)
-                if mermaid_diagram := result.get("mermaid_diagram"):
-                    st.header("Mermaid Diagram")
-                    st.markdown(f"```mermaid\n{mermaid_diagram}\n```")
-                if onboarding := result.get("onboarding_guide"):
-                    st.header("Onboarding Guide")
-                    st.markdown(onboarding)
-                if change_impact := result.get("change_impact_analysis"):
-                    st.header("Change Impact Analysis")
-                    st.markdown(change_impact)
 else:
     st.info("Configure the repo details in the sidebar and press *Run Analysis* to begin.")
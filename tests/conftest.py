@@ -0,0 +1,51 @@
+"""Shared fixtures for the backend test suite."""
+
+from __future__ import annotations
+
+from itertools import islice, repeat
+from typing import List, Tuple
+
+import pytest
+
+from backend.app.core.config import Settings
+from backend.app.models import Document
+from backend.app.services import RAGPipeline
+
+
+class StubEmbeddingStore:
+    """Minimal FAISS replacement for tests."""
+
+    def __init__(self, model_name: str) -> None:  # noqa: D401
+        self.model_name = model_name
+        self.documents: List[Document] = []
+
+    @classmethod
+    def preload_model(cls, model_name: str) -> None:
+        return None
+
+    @classmethod
+    def _get_cached_model(cls, model_name: str) -> None:
+        return None
+
+    def build(self, documents: List[Document]) -> None:
+        self.documents = documents
+
+    def similarity_search(self, query: str, k: int = 5) -> List[Tuple[Document, float]]:  # noqa: D401
+        return list(zip(islice(self.documents, k), repeat(0.0)))
+
+
+@pytest.fixture(scope="session")
+def shared_rag_pipeline(tmp_path_factory: pytest.TempPathFactory) -> RAGPipeline:
+    """Build the pipeline (settings, fetcher, LLM client) once for the whole session."""
+
+    settings = Settings(workspace_dir=tmp_path_factory.mktemp("workspace"))
+    return RAGPipeline(settings)
+
+
+@pytest.fixture
+def rag_pipeline(shared_rag_pipeline: RAGPipeline, monkeypatch: pytest.MonkeyPatch) -> RAGPipeline:
+    """Per-test view of the shared pipeline with a stub vector store and an empty corpus cache."""
+
+    monkeypatch.setattr("backend.app.services.rag_service.EmbeddingStore", StubEmbeddingStore)
+    shared_rag_pipeline._corpus_cache.clear()
+    return shared_rag_pipeline
@@ -0,0 +1,100 @@
+"""Tests for repository file discovery and parsing."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from backend.app.services.document_parser import DocumentParser
+
+
+def _write(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def test_parse_skips_excluded_directories(tmp_path: Path) -> None:
+    _write(tmp_path / "pkg" / "module.py", "print('hi')")
+    _write(tmp_path / "pkg" / "node_modules" / "dep.py", "print('dep')")
+    _write(tmp_path / "pkg" / "dist" / "bundle.py", "print('bundle')")
+    _write(tmp_path / "pkg" / "notes.txt", "ignored by include globs")
+
+    documents = DocumentParser(tmp_path).parse(
+        include_globs=["**/*.py"],
+        exclude_globs=["**/node_modules/**", "**/dist/**"],
+        max_files=10,
+    )
+
+    assert [doc.path.as_posix() for doc in documents] == ["pkg/module.py"]
+
+
+def test_parse_respects_max_files_in_sorted_order(tmp_path: Path) -> None:
+    for name in ("c", "a", "b"):
+        _write(tmp_path / "src" / f"{name}.py", f"# {name}")
+
+    documents = DocumentParser(tmp_path).parse(
+        include_globs=["**/*.py"],
+        exclude_globs=["**/.git/**"],
+        max_files=2,
+    )
+
+    assert [doc.path.as_posix() for doc in documents] == ["src/a.py", "src/b.py"]
+
+
+def test_parse_skips_binary_and_invalid_utf8_files(tmp_path: Path) -> None:
+    _write(tmp_path / "text.py", "print('ok')\r\n")
+    (tmp_path / "binary.py").write_bytes(b"abc\x00def")
+    (tmp_path / "latin1.py").write_bytes("caf\xe9".encode("latin-1"))
+
+    documents = DocumentParser(tmp_path).parse(
+        include_globs=["*.py"],
+        exclude_globs=["**/.git/**"],
+        max_files=10,
+    )
+
+    assert [(doc.path.as_posix(), doc.content) for doc in documents] == [("text.py", "print('ok')\n")]
+
+
+def test_parse_only_prunes_nested_literal_directory_excludes(tmp_path: Path) -> None:
+    _write(tmp_path / "docs" / "a.py", "# a")
+    _write(tmp_path / "pkg" / "docs" / "b.py", "# b")
+    _write(tmp_path / "pkg" / "tests" / "c.py", "# c")
+    _write(tmp_path / "tests" / "d.py", "# d")
+    _write(tmp_path / "node_modules" / "e.py", "# e")
+    _write(tmp_path / "pkg" / "node_modules" / "f.py", "# f")
+
+    documents = DocumentParser(tmp_path).parse(
+        include_globs=["**/*.py"],
+        exclude_globs=["docs/**", "**/tests", "**/node_modules/**"],
+        max_files=10,
+    )
+
+    assert [doc.path.as_posix() for doc in documents] == [
+        "node_modules/e.py",
+        "pkg/docs/b.py",
+        "pkg/tests/c.py",
+        "tests/d.py",
+    ]
+
+
+def test_parse_max_files_follows_sorted_path_order_across_directories(tmp_path: Path) -> None:
+    _write(tmp_path / "z.py", "# z")
+    _write(tmp_path / "a" / "x.py", "# x")
+    _write(tmp_path / "a.py", "# a")
+
+    parser = DocumentParser(tmp_path)
+
+    assert [doc.path.as_posix() for doc in parser.parse(["**/*.py", "*.py"], [], max_files=1)] == ["a/x.py"]
+    assert [doc.path.as_posix() for doc in parser.parse(["**/*.py", "*.py"], [], max_files=3)] == [
+        "a/x.py",
+        "a.py",
+        "z.py",
+    ]
+
+
+def test_parse_skips_known_binary_suffixes_without_sniffing(tmp_path: Path) -> None:
+    _write(tmp_path / "logo.PNG", "looks like text")
+    _write(tmp_path / "main.py", "print('ok')")
+
+    documents = DocumentParser(tmp_path).parse(include_globs=["*"], exclude_globs=[], max_files=10)
+
+    assert [doc.path.as_posix() for doc in documents] == ["main.py"]
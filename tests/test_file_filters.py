@@ -0,0 +1,108 @@
+"""Tests for the file filtering helpers."""
+
+from __future__ import annotations
+
+import fnmatch
+from pathlib import Path
+
+from backend.app.utils import (
+    compile_fast_globs,
+    compile_globs,
+    excluded_dir_names,
+    is_probably_text,
+    matches_any,
+)
+
+
+def test_is_probably_text_accepts_utf8_split_at_read_boundary(tmp_path: Path) -> None:
+    path = tmp_path / "LICENSE"
+    path.write_bytes(b"a" * 1023 + "é".encode("utf-8"))
+
+    assert is_probably_text(path)
+
+
+def test_is_probably_text_rejects_truncated_utf8_in_short_file(tmp_path: Path) -> None:
+    path = tmp_path / "README"
+    path.write_bytes(b"caf\xe9")
+
+    assert not is_probably_text(path)
+
+
+def test_is_probably_text_rejects_binary_content(tmp_path: Path) -> None:
+    nul = tmp_path / "blob"
+    nul.write_bytes(b"abc\x00def")
+    latin1 = tmp_path / "latin1"
+    latin1.write_bytes("caf\xe9 au lait".encode("latin-1"))
+
+    assert not is_probably_text(nul)
+    assert not is_probably_text(latin1)
+
+
+def test_compiled_globs_match_like_pattern_lists() -> None:
+    patterns = ["**/*.py", "docs/*.md", "**/node_modules/**"]
+    compiled = compile_globs(patterns)
+
+    for candidate in ("src/app.py", "app.py", "docs/index.md", "docs/api/index.md", "web/node_modules/x.js"):
+        path = Path(candidate)
+        assert matches_any(path, compiled) == matches_any(path, patterns), candidate
+        assert matches_any(candidate, compiled) == matches_any(path, patterns), candidate
+
+    assert compile_globs(reversed(patterns)) is compiled
+    assert not matches_any(Path("anything"), compile_globs([]))
+
+
+def test_is_probably_text_decides_known_suffixes_without_reading(tmp_path: Path) -> None:
+    image = tmp_path / "logo.png"
+    image.write_text("plain ascii, but the suffix decides", encoding="utf-8")
+
+    assert is_probably_text(tmp_path / "missing.PY")
+    assert not is_probably_text(image)
+
+
+def test_fast_globs_agree_with_fnmatch() -> None:
+    patterns = [
+        "**/*.py",
+        "**/*.d.ts",
+        "docs/**",
+        "**/Makefile",
+        "**/node_modules/**",
+        "src/*/index.[jt]s",
+    ]
+    candidates = [
+        "app.py",
+        "pkg/app.py",
+        "a/.py",
+        "types/index.d.ts",
+        "docs/intro.md",
+        "docs",
+        "Makefile",
+        "tools/Makefile",
+        "tools/Makefile.am",
+        "node_modules/x.js",
+        "web/node_modules/x.js",
+        "src/ui/index.js",
+        "src/ui/index.ts",
+        "src/ui/index.tsx",
+    ]
+
+    for pattern in patterns:
+        matcher = compile_fast_globs([pattern])
+        for candidate in candidates:
+            assert matcher(candidate) == fnmatch.fnmatch(candidate, pattern), (pattern, candidate)
+
+    assert not compile_fast_globs([])("anything")
+
+
+def test_is_probably_text_accepts_plain_strings(tmp_path: Path) -> None:
+    notes = tmp_path / "NOTES"
+    notes.write_text("plain text", encoding="utf-8")
+
+    assert is_probably_text(str(notes))
+    assert is_probably_text("src/module.PY")
+    assert not is_probably_text("assets/logo.png")
+
+
+def test_excluded_dir_names_only_takes_anchored_literal_segments() -> None:
+    patterns = ["**/node_modules/**", "**/.git/**", "docs/**", "**/tests", "**/a/b/**", "**/*.egg/**"]
+
+    assert excluded_dir_names(patterns) == {"node_modules", ".git"}
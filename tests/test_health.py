@@ -11,3 +11,14 @@ def test_health_endpoint_returns_ok() -> None:
 
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+
+
+def test_startup_preloads_embedding_model(monkeypatch) -> None:
+    sentinel = object()
+    monkeypatch.setattr(
+        "backend.app.main.EmbeddingStore.preload_model",
+        classmethod(lambda cls, model_name: sentinel),
+    )
+
+    with TestClient(app) as client:
+        assert client.app.state.embedding_model is sentinel
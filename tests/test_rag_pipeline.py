@@ -2,50 +2,118 @@
 
 from __future__ import annotations
 
+import time
 from pathlib import Path
-from typing import List, Tuple
+from typing import List
 
 import pytest
+from anyio import create_task_group
 
-from backend.app.core.config import Settings
-from backend.app.models import Document
 from backend.app.schemas.requests import RepositoryAnalysisRequest
 from backend.app.services import RAGPipeline
+from backend.app.services.document_parser import DocumentParser
 
 
-class StubEmbeddingStore:
-    """Minimal FAISS replacement for tests."""
+@pytest.mark.asyncio
+async def test_pipeline_generates_artifacts(monkeypatch, rag_pipeline: RAGPipeline, tmp_path: Path) -> None:
+    repo_dir = tmp_path / "sample"
+    repo_dir.mkdir()
+    (repo_dir / "README.md").write_text("# Sample Repo\n\nSome introductory text", encoding="utf-8")
+    (repo_dir / "src").mkdir()
+    (repo_dir / "src" / "module.py").write_text("print('hello world')", encoding="utf-8")
+
+    monkeypatch.setattr(rag_pipeline.fetcher, "fetch", lambda *args, **kwargs: (repo_dir, "abc123"))
 
-    def __init__(self, model_name: str) -> None:  # noqa: D401
-        self.model_name = model_name
-        self.documents: List[Document] = []
+    payload = RepositoryAnalysisRequest(repo_url="https://example.com/org/repo.git")
 
-    def build(self, documents: List[Document]) -> None:
-        self.documents = documents
+    result = await rag_pipeline.analyze_repository(payload)
 
-    def similarity_search(self, query: str, k: int = 5) -> List[Tuple[Document, float]]:  # noqa: D401
-        return [(doc, 0.0) for doc in self.documents[:k]]
+    assert result.repo_url == str(payload.repo_url)
+    assert any(artifact.name == "Repository Summary" for artifact in result.artifacts)
+    assert "graph TD" in result.mermaid_diagram
+    assert result.architecture_map
 
 
 @pytest.mark.asyncio
-async def test_pipeline_generates_artifacts(monkeypatch, tmp_path: Path) -> None:
+async def test_pipeline_reuses_corpus_for_unchanged_commit(
+    monkeypatch, rag_pipeline: RAGPipeline, tmp_path: Path
+) -> None:
     repo_dir = tmp_path / "sample"
     repo_dir.mkdir()
-    (repo_dir / "README.md").write_text("# Sample Repo\n\nSome introductory text", encoding="utf-8")
     (repo_dir / "src").mkdir()
     (repo_dir / "src" / "module.py").write_text("print('hello world')", encoding="utf-8")
 
-    settings = Settings(workspace_dir=tmp_path)
-    pipeline = RAGPipeline(settings)
+    head_sha = "abc123"
+    monkeypatch.setattr(rag_pipeline.fetcher, "fetch", lambda *args, **kwargs: (repo_dir, head_sha))
+
+    parse_calls: List[Path] = []
+    original_parse = DocumentParser.parse
+
+    def counting_parse(self, *args, **kwargs):
+        parse_calls.append(self.base_path)
+        return original_parse(self, *args, **kwargs)
 
-    monkeypatch.setattr(pipeline.fetcher, "fetch", lambda *args, **kwargs: repo_dir)
-    monkeypatch.setattr("backend.app.services.rag_service.EmbeddingStore", StubEmbeddingStore)
+    monkeypatch.setattr(DocumentParser, "parse", counting_parse)
 
     payload = RepositoryAnalysisRequest(repo_url="https://example.com/org/repo.git")
 
-    result = await pipeline.analyze_repository(payload)
+    await rag_pipeline.analyze_repository(payload)
+    await rag_pipeline.analyze_repository(payload)
+    assert len(parse_calls) == 1
 
-    assert result.repo_url == str(payload.repo_url)
-    assert any(artifact.name == "Repository Summary" for artifact in result.artifacts)
-    assert "graph TD" in result.mermaid_diagram
-    assert result.architecture_map
\ No newline at end of file
+    head_sha = "def456"
+    await rag_pipeline.analyze_repository(payload)
+    assert len(parse_calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_pipeline_serialises_fetch_and_parse_per_repository(
+    monkeypatch, rag_pipeline: RAGPipeline, tmp_path: Path
+) -> None:
+    repo_dir = tmp_path / "shared"
+    (repo_dir / "src").mkdir(parents=True)
+
+    def checkout(repo_url, branch, refresh):
+        # Both branches share one worktree, as with the real fetcher.
+        (repo_dir / "src" / "main.py").write_text(f"# {branch}", encoding="utf-8")
+        time.sleep(0.05)
+        return repo_dir, branch
+
+    monkeypatch.setattr(rag_pipeline.fetcher, "fetch", checkout)
+
+    async with create_task_group() as tg:
+        for branch in ("first", "second"):
+            payload = RepositoryAnalysisRequest(repo_url="https://example.com/org/repo.git", branch=branch)
+            tg.start_soon(rag_pipeline.analyze_repository, payload)
+
+    cached = {key[1]: documents[0].content for key, (documents, _) in rag_pipeline._corpus_cache.items()}
+    assert cached == {"first": "# first", "second": "# second"}
+
+
+@pytest.mark.asyncio
+async def test_fetch_error_is_not_held_behind_model_preload(monkeypatch, rag_pipeline: RAGPipeline) -> None:
+    def slow_preload(model_name):
+        time.sleep(1.0)
+
+    def failing_fetch(*args, **kwargs):
+        raise ValueError("bad repository")
+
+    monkeypatch.setattr("backend.app.services.rag_service.EmbeddingStore.preload_model", slow_preload)
+    monkeypatch.setattr(rag_pipeline.fetcher, "fetch", failing_fetch)
+
+    started = time.perf_counter()
+    with pytest.raises(ValueError, match="bad repository"):
+        await rag_pipeline.analyze_repository(RepositoryAnalysisRequest(repo_url="https://example.com/org/repo.git"))
+    assert time.perf_counter() - started < 0.5
+
+
+@pytest.mark.asyncio
+async def test_prewarm_is_skipped_when_model_is_cached(monkeypatch, rag_pipeline: RAGPipeline, tmp_path: Path) -> None:
+    preloads: List[str] = []
+    monkeypatch.setattr("backend.app.services.rag_service.EmbeddingStore._get_cached_model", lambda name: object())
+    monkeypatch.setattr("backend.app.services.rag_service.EmbeddingStore.preload_model", preloads.append)
+    monkeypatch.setattr(rag_pipeline.fetcher, "fetch", lambda *args, **kwargs: (tmp_path, "abc123"))
+
+    await rag_pipeline.analyze_repository(RepositoryAnalysisRequest(repo_url="https://example.com/org/repo.git"))
+
+    assert preloads == []
@@ -0,0 +1,54 @@
+"""Tests for cloning and refreshing repository worktrees."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from git import Actor, Repo
+
+from backend.app.core.config import Settings
+from backend.app.services.repo_loader import RepositoryFetcher
+
+
+AUTHOR = Actor("Test", "test@example.com")
+
+
+def _commit(repo: Repo, name: str, content: str) -> str:
+    (Path(repo.working_tree_dir) / name).write_text(content, encoding="utf-8")
+    repo.index.add([name])
+    return repo.index.commit(f"Add {name}", author=AUTHOR, committer=AUTHOR).hexsha
+
+
+def _make_origin(tmp_path: Path) -> Repo:
+    origin = Repo.init(tmp_path / "origin", initial_branch="main")
+    _commit(origin, "README.md", "first")
+    _commit(origin, "module.py", "second")
+    return origin
+
+
+def test_fetch_clones_shallow_and_returns_head_sha(tmp_path: Path) -> None:
+    origin = _make_origin(tmp_path)
+    fetcher = RepositoryFetcher(Settings(workspace_dir=tmp_path / "workspace"))
+
+    destination, head_sha = fetcher.fetch(f"file://{origin.working_tree_dir}")
+
+    clone = Repo(destination)
+    assert head_sha == origin.head.commit.hexsha
+    assert len(list(clone.iter_commits())) == 1
+    assert (destination / "module.py").read_text(encoding="utf-8") == "second"
+
+
+def test_fetch_updates_existing_clone_to_requested_branch(tmp_path: Path) -> None:
+    origin = _make_origin(tmp_path)
+    repo_url = f"file://{origin.working_tree_dir}"
+    fetcher = RepositoryFetcher(Settings(workspace_dir=tmp_path / "workspace"))
+    fetcher.fetch(repo_url)
+
+    origin.git.checkout("-b", "feature")
+    feature_sha = _commit(origin, "feature.py", "feature")
+    origin.git.checkout("main")
+
+    destination, head_sha = fetcher.fetch(repo_url, branch="feature")
+
+    assert head_sha == feature_sha
+    assert (destination / "feature.py").exists()